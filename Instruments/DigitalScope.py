@@ -1,74 +1,677 @@
+import csv
+import functools
+import json
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
+import numpy as np
 import pyvisa as visa
 from pyvisa.attributes import *
 from pyvisa.constants import *
 
+# ? the shared ResourceManager works both as a package import and when a
+# ? driver file is run directly as a script
+try:
+    from ._visa import get_resource_manager
+except ImportError:
+    from _visa import get_resource_manager
+
+try:
+    from scipy.signal import windows as _windows
+    def _make_window(window_type,N):
+        return getattr(_windows,window_type)(N)
+except ImportError:
+    # ? numpy ships the common windows under its own names, enough for the
+    # ? analysis defaults when scipy is absent
+    _NP_WINDOWS = {'hann' : np.hanning,'hamming' : np.hamming,
+                   'blackman' : np.blackman,'bartlett' : np.bartlett}
+    def _make_window(window_type,N):
+        return _NP_WINDOWS[window_type](N)
+
+try:
+    # ? FFTW keeps its twiddle/plan tables in an interface cache, repeated
+    # ? transforms of the same record length skip the planning work
+    import pyfftw
+    pyfftw.interfaces.cache.enable()
+    from pyfftw.interfaces.numpy_fft import rfft as _rfft
+    from numpy.fft import rfftfreq as _rfftfreq
+    _FFT_KWARGS = {'threads' : pyfftw.config.NUM_THREADS}
+except ImportError:
+    try:
+        # ? pocketfft backend, multi-threaded via workers
+        from scipy.fft import rfft as _rfft, rfftfreq as _rfftfreq
+        _FFT_KWARGS = {'workers' : -1}
+    except ImportError:
+        # scipy < 1.4
+        _rfft,_rfftfreq = np.fft.rfft,np.fft.rfftfreq
+        _FFT_KWARGS = {}
+
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    # ? serializes ndarrays natively, no per-sample Python objects
+    import orjson
+except ImportError:
+    orjson = None
+
+if njit is not None :
+    # ? fuses the subtract/scale/offset passes into one parallel sweep, the
+    # ? plain NumPy expression materializes an intermediate per operator
+    @njit(parallel=True,fastmath=True,cache=True,nogil=True)
+    def _scale_wave(raw,y_reference,y_increment,y_origin):
+        N = raw.shape[0]
+        voltages = np.empty(N,np.float32)
+        for i in prange(N):
+            voltages[i] = (raw[i] - y_reference) * y_increment + y_origin
+        return voltages
+else:
+    _scale_wave = None
+
+
+# * Min/max decimation of a long trace down to ~target plotted points
+# ? matplotlib rasterizes every sample but the figure only has a few
+# ? thousand x pixels, keeping the per-column envelope preserves the shape
+def _minmax_decimate(times,voltages,target=6000):
+    n = len(voltages)
+    if n <= target :
+        return times,voltages
+    block = n // (target // 2)
+    cols = voltages[:block * (target // 2)].reshape(-1,block)
+    decimated = np.empty(cols.shape[0] * 2,dtype=voltages.dtype)
+    decimated[0::2] = cols.min(axis=1)
+    decimated[1::2] = cols.max(axis=1)
+    return np.repeat(times[::block][:cols.shape[0]],2),decimated
+
+
+# * Materialize the time axis of a fetched waveform when it is needed
+# ? fetch_waveform only returns the timebase parameters, a 10M sample record
+# ? would otherwise carry an 80 MB derived times array around
+def times_axis(timebase):
+    start = timebase.get('start',1)
+    return timebase['x_origin'] + (start - 1 + np.arange(timebase['record_length'],dtype=np.float64)) * timebase['x_increment']
+
+if njit is not None :
+    # ? fused mask + power accumulation in one pass over the power spectrum,
+    # ? no boolean mask copy and no filtered temporary
+    @njit(cache=True,nogil=True)
+    def _noise_rms(pxx,harmonic_bins):
+        N = pxx.shape[0]
+        mask = np.ones(N,np.bool_)
+        for b in harmonic_bins :
+            lo = b - 1 if b - 1 > 0 else 0
+            hi = b + 2 if b + 2 < N else N
+            for k in range(lo,hi):
+                mask[k] = False
+        s = 0.0
+        c = 0
+        for i in range(N):
+            if mask[i]:
+                s += pxx[i]
+                c += 1
+        return (s / c) ** 0.5
+else:
+    def _noise_rms(pxx,harmonic_bins):
+        bins = np.asarray(harmonic_bins)
+        # ? build the +/-1 guard bins arithmetically, no Python-level slice
+        # ? store per harmonic
+        excluded = np.unique(np.concatenate((bins - 1,bins,bins + 1)))
+        excluded = excluded[(excluded >= 0) & (excluded < pxx.size)]
+        # ? Parseval style: noise power is the total power minus the guarded
+        # ? harmonic power -- one full sum and a ~30 element gather, no
+        # ? boolean mask over the spectrum and no filtered copy of it
+        noise_power = float(pxx.sum()) - float(pxx[excluded].sum())
+        return (noise_power / (pxx.size - excluded.size)) ** 0.5
+
+if njit is not None :
+    # ? the whole metric reduction in one sweep of the power spectrum:
+    # ? guarded noise accumulation, harmonic tail power and the min/max
+    # ? bins for DNR -- four NumPy passes fused into a single loop that
+    # ? also releases the GIL for concurrent channel analysis
+    @njit(cache=True,nogil=True)
+    def _reduce_metrics(pxx,harmonic_bins):
+        N = pxx.shape[0]
+        mask = np.ones(N,np.bool_)
+        for b in harmonic_bins :
+            lo = b - 1 if b - 1 > 0 else 0
+            hi = b + 2 if b + 2 < N else N
+            for k in range(lo,hi):
+                mask[k] = False
+        noise_sum = 0.0
+        noise_count = 0
+        p_max = 0.0
+        # ? -1 marks 'no positive bin seen yet', avoids inf under fastmath
+        p_min = -1.0
+        for i in range(N):
+            p = pxx[i]
+            if mask[i]:
+                noise_sum += p
+                noise_count += 1
+            if p > p_max :
+                p_max = p
+            if p > 0.0 and (p_min < 0.0 or p < p_min):
+                p_min = p
+        tail_power = 0.0
+        for b in harmonic_bins[1:] :
+            tail_power += pxx[b]
+        return (noise_sum / noise_count) ** 0.5,tail_power,p_max,p_min
+else:
+    _reduce_metrics = None
+
+
+# ? window generation is O(N) trig work, cache it per (window, length) along
+# ? with the sums needed for amplitude/power normalization
+@functools.lru_cache(maxsize=16)
+def _window(window_type,N):
+    window = _make_window(window_type,N).astype(np.float32)
+    # ? the same array is handed out to every caller, freeze it so an
+    # ? accidental in-place edit cannot poison the cache
+    window.setflags(write=False)
+    return window,float(window.sum()),float(np.sum(window ** 2))
+
+
+# * One C-side formatted dump of a time/voltage pair to CSV
+# ? shared by the export paths so the format lives in one place
+def _save_csv(filename,times,voltages):
+    np.savetxt(filename,np.column_stack([times,voltages]),fmt='%.9e',delimiter=',',header='Time (s),Voltage (V)',comments='')
+
+
+# * FFT based distortion/noise metrics of a captured waveform
+# ? the FFT bins are uniformly spaced (df = 1/(N*dt)), so every harmonic bin
+# ? is just round(k*Fc/df) -- no per-harmonic scan of the spectrum is needed
+def analyze_fft_with_inputs(volts,dt,fundamental=None,window_type='hann',n_harmonics=10):
+    # ? float32 halves the memory bandwidth of the transform
+    volts_arr = np.asarray(volts,dtype=np.float32)
+    N = volts_arr.size
+    window,window_sum,window_power = _window(window_type,N)
+    if volts_arr is not volts :
+        # ? asarray already made a private copy (list or wrong-dtype input),
+        # ? window it in place instead of allocating a second array
+        volts_arr *= window
+        volts_win = volts_arr
+    else:
+        volts_win = volts_arr * window
+    # ? real input -> rfft computes only the unique half spectrum, the DC
+    # ? bin is dropped to keep the f > 0 semantics; everything downstream
+    # ? works on the power spectrum |X|^2 -- no per-bin sqrt, the roots are
+    # ? taken only at the scalar reduction endpoints
+    fft_full = _rfft(volts_win,**_FFT_KWARGS)
+    fft_vals = fft_full[1:]
+    pxx = np.square(fft_vals.real) + np.square(fft_vals.imag)
+    # ? Parseval: the spectrum already carries sum(x^2), so the windowed RMS
+    # ? needs no second N-length time-domain reduction. DC and (for even N)
+    # ? Nyquist appear once in the half spectrum, every other bin twice
+    spectral_power = 2.0 * float(pxx.sum()) + float(fft_full[0].real) ** 2
+    if N % 2 == 0 :
+        spectral_power -= float(pxx[-1])
+    total_rms = spectral_power ** 0.5 / N
+    fft_freqs_pos = _rfftfreq(N,dt)[1:]
+    df = 1.0 / (N * dt)
+    if fundamental is None :
+        # ? squaring is monotone, the peaks are the same bins; 5 % of the
+        # ? max magnitude is 0.25 % of the max power. With a single global
+        # ? threshold the local-max test is three SIMD comparisons, no
+        # ? find_peaks Python machinery needed
+        interior = pxx[1:-1]
+        local_max = (interior > pxx[:-2]) & (interior > pxx[2:]) & (interior > np.max(pxx) * 0.0025)
+        peaks = np.flatnonzero(local_max) + 1
+        if peaks.size :
+            fundamental_idx = peaks[np.argmax(pxx[peaks])]
+        else:
+            fundamental_idx = int(np.argmax(pxx))
+        fundamental = fft_freqs_pos[fundamental_idx]
+        if 0 < fundamental_idx < pxx.size - 1 :
+            # ? three-point parabolic interpolation on the magnitudes gives
+            # ? sub-bin resolution -- a bin-snapped Fc is off by up to df/2
+            # ? and that error multiplies into every harmonic position
+            left = float(np.sqrt(pxx[fundamental_idx - 1]))
+            center = float(np.sqrt(pxx[fundamental_idx]))
+            right = float(np.sqrt(pxx[fundamental_idx + 1]))
+            denom = left - 2.0 * center + right
+            if denom != 0.0 :
+                # ? the +1 maps back to the full grid with the DC bin dropped
+                fundamental = (fundamental_idx + 1 + 0.5 * (left - right) / denom) * df
+    harmonics_freqs = fundamental * np.arange(1,n_harmonics + 1)
+    # ? the rfft grid is uniform, so nearest-bin lookup is plain rounding,
+    # ? O(1) per harmonic -- no searchsorted over the spectrum needed;
+    # ? the -1 accounts for the dropped DC bin, intp is the indexing dtype
+    harmonics_bins = np.rint(harmonics_freqs / df).astype(np.intp) - 1
+    harmonics_bins = harmonics_bins[(harmonics_bins >= 0) & (harmonics_bins < pxx.size)]
+    harmonics_power = pxx[harmonics_bins]
+    signal_amp = float(np.sqrt(harmonics_power[0]))
+    if _reduce_metrics is not None :
+        noise_rms,tail_power,p_max,p_min = _reduce_metrics(pxx,harmonics_bins)
+    else:
+        noise_rms = _noise_rms(pxx,harmonics_bins)
+        tail_power = float(np.sum(harmonics_power[1:]))
+        p_max = float(np.max(pxx))
+        # ? masked fused reduction, no filtered copy of the spectrum; inf
+        # ? falls out when no bin is positive and maps to the -1 sentinel
+        p_min = float(np.min(pxx,where=pxx > 0,initial=np.inf))
+        if not np.isfinite(p_min):
+            p_min = -1.0
+    THD = float(np.sqrt(tail_power / harmonics_power[0])) * 100 if tail_power > 0.0 else 0.0
+    SNR = 20 * np.log10(signal_amp / noise_rms)
+    # ? power ratio -> 10*log10 gives the same dB as 20*log10 on amplitudes
+    DNR = 10 * np.log10(p_max / p_min) if p_min > 0.0 else np.nan
+    # ? single fused in-place sqrt turns power back into magnitude for the
+    # ? returned spectrum, keeping the API unchanged
+    fft_vals_pos = np.sqrt(pxx,out=pxx)
+    return {
+        'fundamental_freq' : fundamental,
+        'fundamental_amp' : signal_amp,
+        'THD' : THD,
+        'SNR' : SNR,
+        'DNR' : DNR,
+        'total_rms' : total_rms,
+        'fft_freqs' : fft_freqs_pos,
+        'fft_magnitude' : fft_vals_pos,
+    }
+
 class dpo_2014B:
 
+    __slots__ = ('scope', '_preamble_cache', '_state', '_pending', '_fig', '_ax', '_lines')
+
     def __init__(self, usb_id):
-        rm = visa.ResourceManager()
+        # ? the ResourceManager is shared process-wide via _visa, backend
+        # ? startup walks the VISA installation and is paid only once
+        rm = get_resource_manager()
         # rm.list_resources()
         self.scope = rm.open_resource(usb_id)
         self.scope.read_termination = '\n'
         self.scope.write_termination = '\n'
+        # ? large chunk size so a full CURVE? record arrives in one or two
+        # ? low-level reads instead of hundreds of 20 kB ones
+        self.scope.chunk_size = 1024 * 1024
+        # ? multi-MB WORD records can outlast the 2 s pyvisa default
+        self.scope.timeout = 10000
+        # ? stop the scope prepending header text to every response, the
+        # ? parsers here all expect bare values
+        self.scope.write('HEADer OFF')
+        # ? route the OPC bit of the event status register to SRQ so waits
+        # ? can sleep on the service request line instead of polling
+        self.scope.write('*ESE 1;*SRE 32')
+        # ? waveform preamble cache, keyed by channel number
+        self._preamble_cache = {}
+        # ? write-through cache of scope state only our setters can change
+        self._state = {}
+        # ? queued parameter writes, coalesced per SCPI header on flush
+        self._pending = OrderedDict()
+        # ? figure/axes/lines reused across repeated plot exports
+        self._fig = None
+        self._ax = None
+        self._lines = {}
 
         # self.reset()
 
+    # ? rapid parameter sweeps can queue writes faster than the scope eats
+    # ? them; only the latest value per header is worth sending
+    def _enqueue(self,header,value):
+        self._pending.pop(header,None)
+        self._pending[header] = value
+
+    def flush(self):
+        if self._pending :
+            self.scope.write(';'.join(f':{header} {value}' for header,value in self._pending.items()))
+            self._pending.clear()
+
+    # ? every readback funnels through here so queued writes always hit the
+    # ? scope before the value they may affect is read -- no query path can
+    # ? bypass the coalescer
+    def _query(self,command):
+        self.flush()
+        return self.scope.query(command)
+
+    # ? close only the session, the shared ResourceManager stays up for the
+    # ? other instruments of the process
+    def close(self):
+        # ? push queued writes out instead of silently dropping them
+        self.flush()
+        self.scope.close()
+
     def get_IDN(self):
-        return (self.scope.query('*IDN?'))
+        return (self._query('*IDN?'))
 
     def reset(self):
-        self.scope.write('*RST')     
+        self.scope.write('*RST')
+        self._preamble_cache.clear()
+        self._state.clear()
+        # ? pre-reset parameter writes must not replay onto the fresh state
+        self._pending.clear()
 
     def get_error(self):
-        return self.scope.query('SYST:ERR?')  
+        return self._query('SYST:ERR?')  
     
     def meas_Freq(self,Meas='MEAS1'):
         self.scope.write(f'MEASUrement:{Meas}:TYPE FREQUENCY')
-        return float(self.scope.query('MEASUrement:MEAS1:VALUE?'))
+        return float(self._query('MEASUrement:MEAS1:VALUE?'))
     
     def set_trigger__mode(self,mode='AUTO'):
         # TRIGger:MAIn:MODe { AUTO | NORMal }
         self.scope.write(f'TRIGger:MAIn:MODe {mode}')
 
+    # ? the whole edge trigger setup goes out as one ';:' chained message,
+    # ? one round trip instead of four
     def init_scopePosEdge__Trigger(self,channel='CH1'):
-        self.scope.write(':TRIG:A:TYP EDG')
-        self.scope.write(f':TRIG:A:EDGE:SOU {channel}')
-        self.scope.write(':TRIG:A:EDGE:SLO RIS')
-        self.scope.write('ACQUIRE:STOPAFTER SEQUENCE')
-        # self.scope.write('ACTONEV:EVENTTYP TRIG')
-        # self.scope.write(':ACTONEV:NUMACQ 1')
-        # self.scope.write(':ACTONEV:REPEATC 1')
-        
+        self.scope.write(f':TRIG:A:TYP EDG;:TRIG:A:EDGE:SOU {channel};:TRIG:A:EDGE:SLO RIS;:ACQUIRE:STOPAFTER SEQUENCE')
+        self._preamble_cache.clear()
+
     def init_scopeNegEdge__Trigger(self,channel='CH1'):
-        self.scope.write(':TRIG:A:TYP EDG')
-        self.scope.write(f':TRIG:A:EDGE:SOU {channel}')
-        self.scope.write(':TRIG:A:EDGE:SLO FALL')
-        self.scope.write('ACQUIRE:STOPAFTER SEQUENCE')
-        # self.scope.write('ACTONEV:EVENTTYP TRIG')
-        # self.scope.write(':ACTONEV:NUMACQ 1')
-        # self.scope.write(':ACTONEV:REPEATC 1')
+        self.scope.write(f':TRIG:A:TYP EDG;:TRIG:A:EDGE:SOU {channel};:TRIG:A:EDGE:SLO FALL;:ACQUIRE:STOPAFTER SEQUENCE')
+        self._preamble_cache.clear()
 
     def single_Trigger__ON(self):
+        self.flush()
         self.scope.write('ACQuire:STATE ON')
+        self._preamble_cache.clear()
     def single_Trigger__RUN(self):
+        self.flush()
         self.scope.write('ACQuire:STATE RUN')
+        self._preamble_cache.clear()
     def set_Channel__VScale(self,channel=1,scale=0.05):
-        self.scope.write(f'CH{str(channel)}:SCAle {str(scale)}')
+        self._enqueue(f'CH{str(channel)}:SCAle',str(scale))
+        self._preamble_cache.clear()
     def get_Channel__VScale(self,channel=1):
-        return float(self.scope.query(f'CH{str(channel)}:SCAle?'))
+        return float(self._query(f'CH{str(channel)}:SCAle?'))
     def set_HScale(self,scale='400E-9'):
-        self.scope.write(f'HORizontal:MAIn:SCAle {scale}')
+        self._enqueue('HORizontal:MAIn:SCAle',str(scale))
+        self._preamble_cache.clear()
+        self._state.pop('record_length',None)
     def get_HScale(self):
-        return float(self.scope.query(f'HORizontal:MAIn:SCAle'))
+        return float(self._query(f'HORizontal:MAIn:SCAle'))
     
     def set_autoSet(self):
         self.scope.write('AUTOSet EXECute')
+        self._preamble_cache.clear()
+        self._state.clear()
+
+    # * Switch a channel display on/off, writing through the state cache
+    def set_Channel__Display(self,channel=1,on=True):
+        state = 'ON' if on else 'OFF'
+        self.scope.write(f'SELect:CH{str(channel)} {state}')
+        self._state[f'display_CH{str(channel)}'] = on
+
+    # * Display state of all four channels, served from the state cache
+    # ? set_Channel__Display writes through the cache, so the compound
+    # ? refresh query only runs while some channel is still unknown
+    def _display_states(self):
+        if any(f'display_CH{str(channel)}' not in self._state for channel in range(1,5)):
+            states = self._query('SELect:CH1?;:SELect:CH2?;:SELect:CH3?;:SELect:CH4?').split(';')
+            for channel,state in enumerate(states,1):
+                # ? read_termination already strips the terminator, the split
+                # ? tokens are bare digits so no per-token strip needed
+                self._state[f'display_CH{str(channel)}'] = state in ('1','ON')
+        return {channel : self._state[f'display_CH{str(channel)}'] for channel in range(1,5)}
+
+    # * Record length, served from the cache when our setters own the state
+    def get_Record__Length(self):
+        record_length = self._state.get('record_length')
+        if record_length is None :
+            record_length = int(float(self._query('HORizontal:RECOrdlength?')))
+            self._state['record_length'] = record_length
+        return record_length
+
+    # ? binary payloads must not be scanned for the '\n' terminator, a raw
+    # ? sample can legally contain that byte
+    @contextmanager
+    def _binary_mode(self):
+        old_termination = self.scope.read_termination
+        self.scope.read_termination = None
+        try:
+            yield
+        finally:
+            self.scope.read_termination = old_termination
+
+    # * Waveform preamble scaling factors for the selected channel
+    # ? the preamble only changes when timebase/scale/channel setup changes,
+    # ? so it is cached and the setters above clear the cache; YMULT/YOFF
+    # ? depend on the programmed DATA:WIDTH/ENCdg, so the key carries the
+    # ? transfer width too -- a 1-byte fetch must not reuse 2-byte scaling
+    # ! callers program DATA:WIDTH/ENCdg before asking for the preamble
+    def _preamble(self,channel=1,width=2):
+        self.flush()
+        key = (channel,width)
+        if key in self._preamble_cache :
+            return self._preamble_cache[key]
+        # ? source select, all five scaling queries and the record length in
+        # ? one message, a single round trip instead of seven; one split
+        # ? parses the lot -- no per-field scan of a WFMPRE? blob
+        resp = self._query(f'DATA:SOUrce CH{str(channel)};:WFMPRE:XINCR?;:WFMPRE:XZERO?;:WFMPRE:YMULT?;:WFMPRE:YZERO?;:WFMPRE:YOFF?;:WFMPRE:NR_PT?')
+        values = resp.split(';')
+        preamble = tuple(map(float,values[:5]))
+        # ? NR_PT rides along for free and warms the record-length cache
+        self._state['record_length'] = int(float(values[5]))
+        self._preamble_cache[key] = preamble
+        return preamble
+
+    # * Fetch the waveform record of the channel and scale it to volts
+    # ? width=1 (RPB) keeps the payload small, width=2 (SRIbinary) carries the
+    # ? full vertical resolution at twice the transfer size but the same
+    # ? number of round trips
+    # ? returns (voltages, timebase); use times_axis(timebase) for the x axis
+    def fetch_waveform(self,channel=1,width=2):
+        # ? source and transfer format in one chained write
+        if width == 2 :
+            self.scope.write(f'DATA:SOUrce CH{str(channel)};:DATA:ENCdg SRIbinary;:DATA:WIDTH 2')
+            datatype = 'h'
+        else:
+            self.scope.write(f'DATA:SOUrce CH{str(channel)};:DATA:ENCdg RPB;:DATA:WIDTH 1')
+            datatype = 'B'
+        x_increment,x_origin,y_increment,y_origin,y_reference = self._preamble(channel,width)
+        with self._binary_mode():
+            # ? the cached record length lets pyvisa size the receive buffer
+            # ? once instead of growing it chunk by chunk
+            raw = self.scope.query_binary_values('CURVE?',datatype=datatype,container=np.ndarray,data_points=self.get_Record__Length())
+        if _scale_wave is not None :
+            voltages = _scale_wave(raw,y_reference,y_increment,y_origin)
+        else:
+            # ? vectorized sample conversion, float32 halves the memory traffic
+            voltages = (raw.astype(np.float32) - y_reference) * y_increment + y_origin
+        timebase = {'x_origin' : x_origin,'x_increment' : x_increment,'record_length' : raw.size}
+        return voltages,timebase
+
+    # * Fetch only the slice of the record between t_start and t_stop
+    # ? DATA:STARt/STOP clip the transfer on the scope side, so a zoomed
+    # ? window of a 1M sample record moves only its own samples; the sample
+    # ? indices are plain arithmetic on the cached preamble scaling
+    def fetch_waveform_by_time(self,channel=1,t_start=None,t_stop=None,width=2):
+        if width == 2 :
+            encoding,datatype = 'SRIbinary','h'
+        else:
+            encoding,datatype = 'RPB','B'
+        # ? format first so the preamble scaling matches the transfer width
+        self.scope.write(f'DATA:SOUrce CH{str(channel)};:DATA:ENCdg {encoding};:DATA:WIDTH {str(width)}')
+        x_increment,x_origin,y_increment,y_origin,y_reference = self._preamble(channel,width)
+        record_length = self.get_Record__Length()
+        start = 1 if t_start is None else min(record_length,max(1,int((t_start - x_origin) / x_increment) + 1))
+        stop = record_length if t_stop is None else min(record_length,max(start,int((t_stop - x_origin) / x_increment) + 1))
+        self.scope.write(f'DATA:STARt {str(start)};:DATA:STOP {str(stop)}')
+        with self._binary_mode():
+            raw = self.scope.query_binary_values('CURVE?',datatype=datatype,container=np.ndarray,data_points=stop - start + 1)
+        # ? restore full-record transfers for the other fetch paths
+        self.scope.write(f'DATA:STARt 1;:DATA:STOP {str(record_length)}')
+        if _scale_wave is not None :
+            voltages = _scale_wave(raw,y_reference,y_increment,y_origin)
+        else:
+            voltages = (raw.astype(np.float32) - y_reference) * y_increment + y_origin
+        timebase = {'x_origin' : x_origin,'x_increment' : x_increment,'record_length' : raw.size,'start' : start}
+        return voltages,timebase
+
+    # * Save a hardcopy of the scope screen to a file on the PC
+    # ? the payload is binary; it is streamed with read_raw inside
+    # ? _binary_mode, a text query would corrupt it and hold a second copy
+    def save_screen_image(self,filename='screen.png'):
+        self.flush()
+        self.scope.write('HARDCopy STARt')
+        with self._binary_mode(), open(filename,'wb') as file :
+            file.write(self.scope.read_raw())
+
+    # * Raw (unscaled) waveform record of the channel
+    def fetch_waveform_raw(self,channel=1,width=2):
+        self.flush()
+        if width == 2 :
+            self.scope.write(f'DATA:SOUrce CH{str(channel)};:DATA:ENCdg SRIbinary;:DATA:WIDTH 2')
+            datatype = 'h'
+        else:
+            self.scope.write(f'DATA:SOUrce CH{str(channel)};:DATA:ENCdg RPB;:DATA:WIDTH 1')
+            datatype = 'B'
+        with self._binary_mode():
+            return self.scope.query_binary_values('CURVE?',datatype=datatype,container=np.ndarray,data_points=self.get_Record__Length())
+
+    # * Mean/min/max/std of a channel, reduced on the raw integer record
+    # ? the reductions run on the raw integer samples (1- or 2-byte per
+    # ? width) and only the four scalar results are rescaled to volts, no
+    # ? float conversion of the record
+    def get_channel_stats(self,channel=1,width=2):
+        raw = self.fetch_waveform_raw(channel,width)
+        _,_,y_increment,y_origin,y_reference = self._preamble(channel,width)
+        mean = (float(raw.mean()) - y_reference) * y_increment + y_origin
+        std = float(raw.std()) * y_increment
+        return {
+            'mean' : mean,
+            'min' : (float(raw.min()) - y_reference) * y_increment + y_origin,
+            'max' : (float(raw.max()) - y_reference) * y_increment + y_origin,
+            'std' : std,
+            'ptp' : float(np.ptp(raw)) * y_increment,
+            # ? rms follows from mean/std analytically, no extra array pass
+            'rms' : (mean * mean + std * std) ** 0.5,
+        }
+
+    # * Fetch several channels back to back in one pipelined pass
+    # ? a single VISA session serializes anyway, so instead of a thread pool
+    # ? the per-channel setup is hoisted out and the CURVE? transfers run
+    # ? back to back with only a DATA:SOUrce write in between
+    def fetch_all_waveforms(self,channels=None,width=2):
+        if channels is None :
+            channels = [channel for channel,on in self._display_states().items() if on]
+        if width == 2 :
+            self.scope.write('DATA:ENCdg SRIbinary;:DATA:WIDTH 2')
+            datatype = 'h'
+        else:
+            self.scope.write('DATA:ENCdg RPB;:DATA:WIDTH 1')
+            datatype = 'B'
+        # ? warm all preambles first so the transfer loop is pure payload
+        preambles = {channel : self._preamble(channel,width) for channel in channels}
+        channel_data = {}
+        with self._binary_mode():
+            for channel in channels :
+                self.scope.write(f'DATA:SOUrce CH{str(channel)}')
+                raw = self.scope.query_binary_values('CURVE?',datatype=datatype,container=np.ndarray)
+                x_increment,x_origin,y_increment,y_origin,y_reference = preambles[channel]
+                if _scale_wave is not None :
+                    voltages = _scale_wave(raw,y_reference,y_increment,y_origin)
+                else:
+                    voltages = (raw.astype(np.float32) - y_reference) * y_increment + y_origin
+                timebase = {'x_origin' : x_origin,'x_increment' : x_increment,'record_length' : raw.size}
+                channel_data[channel] = (voltages,timebase)
+        return channel_data
+
+    # * One single-sequence capture followed by a gapless multi-channel dump
+    # ? a VISA session serializes everything, so instead of thread-pool
+    # ? pipelining the channels are frozen by one SEQuence acquisition and
+    # ? then read back to back -- no acquisition gaps between the transfers
+    def acquire_single_and_fetch_all(self,channels=None,width=2,timeout=10):
+        self.flush()
+        self.scope.write('ACQuire:STOPAfter SEQuence;:ACQuire:STATE ON')
+        self._preamble_cache.clear()
+        self.wait_for_acquisition_complete(timeout)
+        return self.fetch_all_waveforms(channels,width)
+
+    # * Dump one channel to a CSV file
+    # ? savetxt formats the rows in C, a writer.writerow loop costs a Python
+    # ? call per sample on million-sample records
+    def export_waveform_to_csv(self,channel=1,filename='waveform.csv'):
+        voltages,timebase = self.fetch_waveform(channel)
+        _save_csv(filename,times_axis(timebase),voltages)
+
+    # * Dump one channel to a JSON file as two parallel arrays
+    # ? columnar layout instead of an N-length list of per-sample dicts --
+    # ? the encoder never touches N small Python objects
+    def export_waveform_to_json(self,channel=1,filename='waveform.json'):
+        voltages,timebase = self.fetch_waveform(channel)
+        times = times_axis(timebase)
+        if orjson is not None :
+            with open(filename,'wb') as file :
+                file.write(orjson.dumps({'time' : times,'voltage' : voltages},option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(filename,'w') as file :
+                json.dump({'time' : times.tolist(),'voltage' : voltages.tolist()},file)
+
+    # * Export every displayed channel, optionally plotting them
+    # ? the transfer format is set up once outside the loop and the cached
+    # ? preamble is reused across channels of the same acquisition
+    def export_and_plot_all_waveforms(self,prefix='waveform',image=False):
+        # ? exported data keeps the full 16-bit vertical resolution; signed
+        # ? little-endian needs no byteswap on x86 hosts
+        self.scope.write('DATA:ENCdg SRIbinary;:DATA:WIDTH 2')
+        channel_data = {}
+        channels = [channel for channel,on in self._display_states().items() if on]
+        # ? warm the (text-mode) preamble queries up front so the transfer
+        # ? loop can hold binary mode across all channels, one termination
+        # ? toggle instead of one per channel
+        preambles = {channel : self._preamble(channel) for channel in channels}
+        with self._binary_mode():
+            for channel in channels :
+                self.scope.write(f'DATA:SOUrce CH{str(channel)}')
+                raw = self.scope.query_binary_values('CURVE?',datatype='h',container=np.ndarray)
+                x_increment,x_origin,y_increment,y_origin,y_reference = preambles[channel]
+                if _scale_wave is not None :
+                    voltages = _scale_wave(raw,y_reference,y_increment,y_origin)
+                else:
+                    voltages = (raw.astype(np.float32) - y_reference) * y_increment + y_origin
+                timebase = {'x_origin' : x_origin,'x_increment' : x_increment,'record_length' : raw.size}
+                channel_data[channel] = (voltages,timebase)
+        for channel,(voltages,timebase) in channel_data.items():
+            _save_csv(f'{prefix}_CH{str(channel)}.csv',times_axis(timebase),voltages)
+        if image and channel_data :
+            # ? matplotlib costs ~100 ms to import, only pay it when a plot
+            # ? is actually wanted
+            import matplotlib.pyplot as plt
+            # ? decimate the drawn path, the raster has ~3000 x pixels anyway
+            plt.rcParams['path.simplify'] = True
+            plt.rcParams['path.simplify_threshold'] = 1.0
+            if self._fig is None :
+                self._fig,self._ax = plt.subplots(figsize=(10,6))
+                self._ax.set_xlabel('Time (s)')
+                self._ax.set_ylabel('Voltage (V)')
+            timebases = {(timebase['x_origin'],timebase['x_increment'],timebase['record_length'])
+                         for _,timebase in channel_data.values()}
+            if len(timebases) == 1 and not self._lines :
+                # ? all channels share one timebase: decimate against a single
+                # ? x array and create every Line2D in one plot call on the
+                # ? stacked (N, C) matrix instead of C separate calls
+                times = times_axis(next(iter(channel_data.values()))[1])
+                decimated = {channel : _minmax_decimate(times,voltages)
+                             for channel,(voltages,_) in channel_data.items()}
+                times_dec = next(iter(decimated.values()))[0]
+                matrix = np.column_stack([voltages for _,voltages in decimated.values()])
+                lines = self._ax.plot(times_dec,matrix)
+                for channel,line in zip(decimated,lines):
+                    line.set_label(f'CH{str(channel)}')
+                    self._lines[channel] = line
+            else:
+                for channel,(voltages,timebase) in channel_data.items():
+                    times,voltages = _minmax_decimate(times_axis(timebase),voltages)
+                    line = self._lines.get(channel)
+                    if line is None :
+                        line, = self._ax.plot(times,voltages,label=f'CH{str(channel)}')
+                        self._lines[channel] = line
+                    else:
+                        # ? update the existing artist instead of rebuilding the figure
+                        line.set_data(times,voltages)
+            self._ax.relim()
+            self._ax.autoscale_view()
+            self._ax.legend()
+            self._fig.savefig(f'{prefix}.png')
+        return channel_data
 
     @property
     def acquireState(self):
-        if float(self.scope.query('ACQuire:STATE?')) == 1.0:
+        if float(self._query('ACQuire:STATE?')) == 1.0:
             State = True 
         else :
             State = False 
@@ -76,39 +679,96 @@ class dpo_2014B:
         return State
     
     def get_trigger__level(self):
-        return float(self.scope.query('TRIGger:MAIn:LEVel?')) 
+        return float(self._query('TRIGger:MAIn:LEVel?')) 
     
     def set_trigger__level(self,level):
-        self.scope.write(f'TRIGger:MAIn:LEVel {str(level)}')
+        self._enqueue('TRIGger:MAIn:LEVel',str(level))
 
     def scopeTrigger_Acquire(self,channel='CH1'):
-        self.scope.write('ACQUIRE:STATE OFF')
-        self.scope.write(f'SELECT:{channel} ON')
-        self.scope.write('ACQUIRE:MODE SAMPLE')
-        self.scope.write('ACQUIRE:STOPAFTER SEQUENCE')
-        # /* Acquire waveform data */
-        self.scope.write('ACQUIRE:STATE ON')
-        # /* Set up the measurement parameters */
-        self.scope.write('MEASUREMENT:IMMED:TYPE FREQUENCY')
-        self.scope.write(f'MEASUREMENT:IMMED:SOURCE {channel}')
+        # /* Acquire waveform data and set up the measurement parameters,
+        #    all chained into a single write */
+        # ? queued parameter writes must land before the sequence arms
+        self.flush()
+        self.scope.write(f'ACQUIRE:STATE OFF;:SELECT:{channel} ON;:ACQUIRE:MODE SAMPLE;:ACQUIRE:STOPAFTER SEQUENCE;:ACQUIRE:STATE ON;:MEASUREMENT:IMMED:TYPE FREQUENCY;:MEASUREMENT:IMMED:SOURCE {channel}')
+        self._state[f'display_{channel}'] = True
+        self._preamble_cache.clear()
         # /* Wait until the acquisition is complete before taking
         # the measurement */
         # While BUSY?
     @property
     def scopeAcquire_BUSY(self):
-        return int(float(self.scope.query('BUSY?')))
+        return int(float(self._query('BUSY?')))
+
+    # * Block until the pending acquisition/operation completes
+    # ? *OPC raises the OPC event when everything before it is done, which
+    # ? (*ESE 1/*SRE 32 in __init__) asserts SRQ -- the wait wakes on actual
+    # ? completion, not on the next poll tick
+    def wait_for_acquisition_complete(self,timeout=10):
+        self.flush()
+        # ? ESR.OPC latches: without clearing the event registers first a
+        # ? second wait would see no new ESB transition and never get an SRQ
+        self.scope.write('*CLS;*OPC')
+        try:
+            self.scope.wait_for_srq(timeout * 1000)
+            self.scope.read_stb()
+        except (visa.errors.VisaIOError,AttributeError,NotImplementedError):
+            # ? transports without SRQ (pyvisa-py over TCPIP) fall back to
+            # ? a coarse BUSY? poll
+            deadline = time.monotonic() + timeout
+            while int(float(self._query('BUSY?'))) and time.monotonic() < deadline :
+                time.sleep(0.05)
+
+    # * Configure a measurement slot in a single compound write
+    # ? TYPE/SOURCE/STATE chained with ';:' costs one round trip, not three
+    def add_measurement(self,slot=1,meas_type='AMPLITUDE',channel=1):
+        self.scope.write(f'MEASUrement:MEAS{str(slot)}:TYPE {meas_type};:MEASUrement:MEAS{str(slot)}:SOUrce CH{str(channel)};:MEASUrement:MEAS{str(slot)}:STATE ON')
+
+    def remove_measurement(self,slot=1):
+        self.scope.write(f'MEASUrement:MEAS{str(slot)}:STATE OFF')
+
+    # * Switch off all eight measurement slots with one write
+    def clear_all_measurements(self):
+        self.scope.write(';'.join(f':MEASUrement:MEAS{str(slot)}:STATE OFF' for slot in range(1,9)))
+
+    # * Read back all eight measurement slots in one round trip
+    def get_all_measurements(self):
+        resp = self._query(';'.join(f':MEASUrement:MEAS{str(slot)}:VALue?' for slot in range(1,9)))
+        results = {}
+        for slot,part in enumerate(resp.split(';'),1):
+            try:
+                value = float(part)
+            except ValueError:
+                continue
+            # ? 9.9E37 is the Tek 'no value' sentinel, surface it as NaN
+            results[f'MEAS{str(slot)}'] = np.nan if value > 9.0e37 else value
+        return results
+
+    # * Configure a set of measurements, wait for them and save the values
+    # ? *OPC? returns as soon as the scope is done instead of a worst case
+    # ? fixed sleep per measurement
+    def measure_and_save(self,measurements,filename='measurements.csv'):
+        for slot,(meas_type,channel) in enumerate(measurements,1):
+            self.add_measurement(slot,meas_type,channel)
+        self._query('*OPC?')
+        results = self.get_all_measurements()
+        with open(filename,'w',newline='') as file :
+            writer = csv.writer(file)
+            writer.writerow(['Slot','Value'])
+            for slot,value in results.items():
+                writer.writerow([slot,value])
+        return results
 
     def Meas_Amp(self,channel='CH1',Meas='MEAS1'):
         # self.scope.write('MEASUREMENT:IMMED:TYPE AMPLITUDE')
         # self.scope.write(f'MEASUREMENT:IMMED:SOURCE {channel}')
         self.scope.write(f'MEASUrement:{Meas}:TYPE AMPLITUDE')
-        return float(self.scope.query(f'MEASUrement:{Meas}:VALUE?'))
+        return float(self._query(f'MEASUrement:{Meas}:VALUE?'))
     
     def Meas_Mean(self,channel='CH1',Meas='MEAS1'):
         # self.scope.write('MEASUREMENT:IMMED:TYPE AMPLITUDE')
         # self.scope.write(f'MEASUREMENT:IMMED:SOURCE {channel}')
         self.scope.write(f'MEASUrement:{Meas}:TYPE MEAN')
-        return float(self.scope.query(f'MEASUrement:{Meas}:VALUE?'))
+        return float(self._query(f'MEASUrement:{Meas}:VALUE?'))
     
 if __name__ == '__main__':
     scope = dpo_2014B('USB0::0x0699::0x0456::C014546::INSTR')
@@ -121,11 +781,8 @@ if __name__ == '__main__':
     scope.init_scopePosEdge__Trigger(channel='CH3')
     # time.sleep(1)
     scope.single_Trigger__ON()
-    time.sleep(1)
     # print('State',scope.acquireState)
-    while scope.acquireState == True :
-       print('rotate')
-    # time.sleep(1)
+    scope.wait_for_acquisition_complete()
     scope.scope.write('ACQUIRE:STATE OFF')
     # scope.single_Trigger__RUN()
 
@@ -1,14 +1,55 @@
-import time 
+import asyncio
+import functools
+import time
+import numpy as np
 import pyvisa as visa
 from pyvisa.attributes import *
 from pyvisa.constants import *
 
+# ? the shared ResourceManager works both as a package import and when a
+# ? driver file is run directly as a script
+try:
+    from ._visa import get_resource_manager
+except ImportError:
+    from _visa import get_resource_manager
+
+
+# ? tuples format to the SCPI list form (@1,2,...) so any setter can
+# ? drive several outputs in one bus transaction
+@functools.lru_cache(maxsize=64)
+def _chanlist_slow(channel):
+    if isinstance(channel,tuple) :
+        return f"(@{','.join(map(str,channel))})"
+    return f'(@{channel})'
+
+# ? the channel-list suffix is rebuilt from the same four ints on nearly
+# ? every SCPI call; the default-arg dict serves 1-4 with one C-level
+# ? get and everything else falls through to the memoized formatter
+def _chanlist(channel,_fast={1:'(@1)',2:'(@2)',3:'(@3)',4:'(@4)',
+                             (1,2,3,4):'(@1,2,3,4)'}):
+    suffix = _fast.get(channel)
+    if suffix is not None :
+        return suffix
+    return _chanlist_slow(channel)
+
+# ? shared ON/OFF vocabulary for the paired setters; a bool indexes the
+# ? tuple directly (False is 0, True is 1), no branch and no dict hash
+_ONOFF = ('OFF', 'ON')
+
+# ? prefixes of the hottest setters prebuilt once; plain str concat in the
+# ? bodies below skips the per-call f-string formatting opcodes
+_CMD_VOLT = 'VOLT '
+_CMD_CURR = 'CURR '
+
 # ('USB0::0x2A8D::0x0F02::MY56002702::INSTR', 'USB0::0x0699::0x0401::C020132::INSTR', 'TCPIP0::172.16.10.29::inst0::INSTR', 'GPIB0::6::INSTR')
 class N670x:
 
+    # ? fixed attribute set, no per-instance __dict__; slot access is an
+    # ? array index instead of a dict probe on every self._w/_q lookup
+    __slots__ = ('my_instr','channel','erroMSG','_setpoints','_id_cache','_w','_q')
+
     def __init__(self,port='USB0::0x2A8D::0x0F02::MY56002702::INSTR') -> None:
-        rm = visa.ResourceManager()
-        rm.list_resources()
+        rm = get_resource_manager()
         self.my_instr = rm.open_resource(port)
         # self.my_instr.set_visa_attribute(visa.constants.VI_ATTR_ASRL_BAUD, 9600)
         # self.my_instr.set_visa_attribute(visa.constants.VI_ATTR_ASRL_DATA_BITS, 8)
@@ -16,6 +57,15 @@ class N670x:
         # self.my_instr.set_visa_attribute(visa.constants.VI_ATTR_ASRL_PARITY, visa.constants.VI_ASRL_PAR_NONE)
         self.my_instr.read_termination = '\n'
         self.my_instr.write_termination = '\n'
+        # ? big transfer buffer so multi-channel reads and ELOG bursts come
+        # ? back in one VISA read instead of fragmented low-level chunks
+        self.my_instr.chunk_size = 1024 * 1024
+        self.my_instr.timeout = 5000
+
+        # ? bind the bus entry points once, every SCPI call below then skips
+        # ? two attribute lookups on the hot submission path
+        self._w = self.my_instr.write
+        self._q = self.my_instr.query
 
         self.channel = {
                             1:"OUT1",
@@ -24,6 +74,14 @@ class N670x:
                             4:"OUT4",
                         }
 
+        # ? last programmed setpoints per (function, channel); re-issuing an
+        # ? identical setpoint is skipped instead of costing a bus write
+        self._setpoints = {}
+
+        # ? identification answers never change within a session; cache them
+        # ? keyed on (query, channel) so repeat calls cost no round trip
+        self._id_cache = {}
+
         self.erroMSG = {
             -100 :"Command error [generic command error]",
             -101 :"Invalid character",
@@ -43,143 +101,212 @@ class N670x:
             -138 :"Suffix not allowed [numeric element does not allow suffixes]"
         }
         
-    # ! SYST:REM system remote connection 
-    # * *IDN?' Instrument id Query 
-    # ? provide the minimum sleep time(1 Sec) to configure for the remote connection time.sleep(1)
+    # ! SYST:REM system remote connection
+    # * *IDN?' Instrument id Query
+    # ? *OPC? blocks until the remote switch is applied, no fixed 1 s settle
     def get_IDN(self):
-        self.my_instr.write('SYST:REM') 
-        time.sleep(1)
-        return (self.my_instr.query('*IDN?'))
+        if '*IDN?' not in self._id_cache :
+            self._w('SYST:REM')
+            self._q('*OPC?')
+            self._id_cache['*IDN?'] = self._q('*IDN?')
+        return self._id_cache['*IDN?']
         
     
-    # * Rest the instrument 
+    # * Send several commands as one ';:' chained message
+    # ? one bus transaction instead of one per command, ':' re-roots each
+    # ? header so absolute commands can be mixed freely
+    def _write_many(self,commands):
+        self._w(';:'.join(commands))
+
+    # * Query counterpart of _write_many: one ';:' chained message out, the
+    # ? instrument answers with ';' separated fields that are split back out
+    def _query_many(self,queries):
+        return self._q(';:'.join(queries)).split(';')
+
+    # * Drain the instrument command queue in one sync point
+    # ? writes are pipelined fire-and-forget, *OPC? answers only after
+    # ? everything queued ahead of it has finished executing
+    def _flush_sync(self):
+        self._q('*OPC?')
+
+    # * Shared body for the '<PREFIX> <value>,(@n)' one-line setters below,
+    # ? the command template lives here once instead of per method
+    def _set(self,prefix,value,channel):
+        self._w(prefix + ' ' + str(value) + ',' + _chanlist(channel))
+
+    # * Bring one channel from power-on to a known operating point in a
+    # * single bus transaction closed by one *OPC? completion query
+    # ? the whole bootstrap rides the instrument's own command queue, one
+    # ? write plus one query instead of a round trip per parameter
+    def full_configure(self,channel:int,voltage:float,current:float,OVP:float=None,OCP_ON:bool=False,output_ON:bool=False):
+        ch = _chanlist(channel)
+        commands = [f'VOLT {str(voltage)},{ch}',
+                    f'CURR {str(current)},{ch}']
+        if OVP is not None :
+            commands.append(f'VOLT:PROT {str(OVP)},{ch}')
+        if OCP_ON :
+            commands.append(f'CURR:PROT:STAT ON,{ch}')
+        if output_ON :
+            commands.append(f'OUTP ON,{ch}')
+        self._write_many(commands)
+        self._flush_sync()
+        # ? keep the skip caches coherent with what just went on the wire
+        self._setpoints[('VOLT',channel)] = voltage
+        self._setpoints[('CURR',channel)] = current
+        if OVP is not None :
+            self._setpoints[('VOLT:PROT',channel)] = OVP
+        if OCP_ON :
+            self._setpoints[('CURR:PROT:STAT',channel)] = True
+        if output_ON :
+            self._setpoints[('OUTP',channel)] = True
+
+    # * Drop everything memoized from the instrument: identification
+    # * answers and the setpoint skip cache
+    # ? call it if the supply state changed outside this driver (front
+    # ? panel, another session) so caches cannot serve stale values
+    def invalidate_cache(self):
+        self._setpoints.clear()
+        self._id_cache.clear()
+
+    # * Rest the instrument
     def reset(self):
-        self.my_instr.write('*RST')  
-
-    # * switch off the Channle 
+        self._w('*RST')
+        self.invalidate_cache()
+
+    # * Switch the channel output on or off from one place
+    # ? re-sending the state already on the wire is skipped like a setpoint
+    def output(self,channel:int,state:bool):
+        state = bool(state)
+        if self._setpoints.get(('OUTP',channel)) == state :
+            return
+        self._w(f'OUTP {_ONOFF[state]},{_chanlist(channel)}')
+        self._setpoints[('OUTP',channel)] = state
+
+    # * switch off the Channle
     def outp_OFF(self,channel:int):
-        self.my_instr.write(f'OUTP OFF,(@{str(channel)})')  
+        self.output(channel,False)
 
-    # * Switch on the channel 
+    # * Switch on the channel
     def outp_ON(self,channel:int):
-        self.my_instr.write(f'OUTP ON,(@{str(channel)})')  
+        self.output(channel,True)
 
     # * Error Que Clear
     def clear_errors(self):
-        self.my_instr.write('*CLS')  
+        self._w('*CLS')  
 
     # * Installed Options in the Channl
     def modelNumber(self,channel:int):
-        return self.my_instr.query(f'SYST:CHAN:MOD? (@{str(channel)})')
+        if ('MOD',channel) not in self._id_cache :
+            self._id_cache[('MOD',channel)] = self._q(f'SYST:CHAN:MOD? {_chanlist(channel)}')
+        return self._id_cache[('MOD',channel)]
     
     # * Serial number of the channel
     def serialNumber(self,channel:int):
-        return self.my_instr.query(f'SYST:CHAN:SER? (@{str(channel)})')
+        if ('SER',channel) not in self._id_cache :
+            self._id_cache[('SER',channel)] = self._q(f'SYST:CHAN:SER? {_chanlist(channel)}')
+        return self._id_cache[('SER',channel)]
     
     # * installed Options in the channel
     def installedOptions(self,channel:int):
-        return self.my_instr.query(f'SYST:CHAN:OPT? (@{str(channel)})')
+        if ('OPT',channel) not in self._id_cache :
+            self._id_cache[('OPT',channel)] = self._q(f'SYST:CHAN:OPT? {_chanlist(channel)}')
+        return self._id_cache[('OPT',channel)]
+
+    # * Model, serial and installed options of a channel in one round trip
+    def get_channel_info(self,channel:int):
+        if ('MOD',channel) not in self._id_cache or ('SER',channel) not in self._id_cache \
+                or ('OPT',channel) not in self._id_cache :
+            model,serial,options = self._query_many((f'SYST:CHAN:MOD? {_chanlist(channel)}',
+                                                     f'SYST:CHAN:SER? {_chanlist(channel)}',
+                                                     f'SYST:CHAN:OPT? {_chanlist(channel)}'))
+            self._id_cache[('MOD',channel)] = model
+            self._id_cache[('SER',channel)] = serial
+            self._id_cache[('OPT',channel)] = options
+        return {'model':self._id_cache[('MOD',channel)],
+                'serial':self._id_cache[('SER',channel)],
+                'options':self._id_cache[('OPT',channel)]}
 
     # Returns the error number and error string
     def errorLog(self):
-        return (self.my_instr.query('SYST:ERR?'))
+        return (self._q('SYST:ERR?'))
 
-    # * Multi channel voltage set method 
-    # ! first argument is the channel number shuold be in int  channel Number 1-4
-    # ! voltage must be in the float ex: 1.4 
-    # ? default it will provide the fist chanlle Voltage 
-    # def setVoltage(self, channel:int, voltage:float):
-    #     if channel in self.channel.keys() :
-    #         ch = self.channel.get(channel)
-    #     else:
-    #         ch = self.channel.get(1)
-    #     command = 'INST:SEL ' +  ch
-    #     self.my_instr.write(command)   
-    #     command = 'VOLT ' + str(voltage) 
-    #     self.my_instr.write(command)  
-
-    # * Multi channel voltage set method 
+    # * Multi channel voltage/current set methods
     # ! first argument is the channel number shuold be in int  channel Number 1-4
-    # ! current must be in the float ex: 1.4 
-    # ? default it will provide the fist chanlle current 
-    # def setCurrent(self, channel:int, current:float):
-    #     if channel in self.channel.keys() :
-    #         ch = self.channel.get(channel)
-    #     else:
-    #         ch = self.channel.get(1)
-    #     command = 'INST:SEL ' +  ch
-    #     self.my_instr.write(command)   
-    #     command = 'CURR ' + str(current) 
-    #     self.my_instr.write(command)  
-
+    # ! value must be in the float ex: 1.4
     def setCurrent(self, channel:int, current:float):
-        self.my_instr.write(f'CURR {current},(@{channel})')
+        if self._setpoints.get(('CURR',channel)) == current :
+            return
+        self._w(_CMD_CURR + str(current) + ',' + _chanlist(channel))
+        self._setpoints[('CURR',channel)] = current
 
     def setVoltage(self, channel:int, voltage:float):
-        self.my_instr.write(f'VOLT {voltage},(@{channel})')
+        if self._setpoints.get(('VOLT',channel)) == voltage :
+            return
+        self._w(_CMD_VOLT + str(voltage) + ',' + _chanlist(channel))
+        self._setpoints[('VOLT',channel)] = voltage
     # ? get the output status 
     def getOutStatus(self):  
         # time.sleep(0.2)
-        return self.my_instr.query('OUTP:STAT?')  
+        return self._q('OUTP:STAT?')  
     
     # * set the Voltage Range of the channel 
     # * Channel Number must be int it is between 1-4 
     # * Voltage range must be float
     def setRange_Voltage(self,channel:int,voltageRange:float):
-        self.my_instr.write(f'VOLT:RANG {str(voltageRange)},(@{str(channel)})')
+        self._set('VOLT:RANG',voltageRange,channel)
 
     # * set the Current Range of the channel 
     # * Channel Number must be int it is between 1-4 
     # * Current range must be float
     def setRange_Current(self,channel:int,voltageRange:float):
-        self.my_instr.write(f'CURR:RANG {str(voltageRange)},(@{str(channel)})')
+        self._set('CURR:RANG',voltageRange,channel)
 
 
     # * set the channel to the current mode =
     # * Channel Number must be int it is between 1-4 
     def setCurrentMode(self,channel:int):
-        self.my_instr.write(f'OUTP:PMOD CURR,(@{str(channel)})')
+        self._set('OUTP:PMOD','CURR',channel)
         
     # * set the channel to the Voltage mode =
     # * Channel Number must be int it is between 1-4 
     def setVoltageMode(self,channel:int):
-        self.my_instr.write(f'OUTP:PMOD VOLT,(@{str(channel)})')
+        self._set('OUTP:PMOD','VOLT',channel)
 
     # * To reverse the relay polarity on units with Option 760
     # * Channel Number must be int it is between 1-4 
     def setReverseRelay_Polarity(self,channel:int):
-        self.my_instr.write(f'OUTP:REL:POL REV,(@{str(channel)})')
+        self._set('OUTP:REL:POL','REV',channel)
 
     # * To return the relay polarity to normal
     # * Channel Number must be int it is between 1-4 
     def setNormalRelay_Polarity(self,channel:int):
-        self.my_instr.write(f'OUTP:REL:POL NORM,(@{str(channel)})')
+        self._set('OUTP:REL:POL','NORM',channel)
 
     # To set the positive current limit of output ex:1 to 1 A:
     def setCurrent_Positive_Limit(self,channel:int,current:float):
-        self.my_instr.write(f'CURR:LIM {str(current)},(@{str(channel)})')
+        self._set('CURR:LIM',current,channel)
 
     # To set the negative current limit, you must first turn limit coupling
     # (tracking) off. Then set the negative current limit
     def setCurrent_Negative_Limit(self,channel:int,current:float):
-        self.my_instr.write(f'CURR:LIM:COUP OFF,(@{str(channel)})')
-        self.my_instr.write(f'CURR:LIM:NEG {str(current)},(@{str(channel)})')
+        # ? coupling off and the negative limit in one chained message
+        self._w(f'CURR:LIM:COUP OFF,{_chanlist(channel)};:CURR:LIM:NEG {str(current)},{_chanlist(channel)}')
 
     # To set the voltage priority mode:
     def setVoltage_Priority(self,channel:int):
-        self.my_instr.write(f'FUNC VOLT,(@{str(channel)})')
+        self._set('FUNC','VOLT',channel)
 
     # To set the Current priority mode:
     def setCurrent_Priority(self,channel:int):
-        self.my_instr.write(f'FUNC CURR,(@{str(channel)})')
+        self._set('FUNC','CURR',channel)
 
     # TTo program turn-on delay 
     def setTurn_ON_Delay(self,channel:int,delay:float):
-        self.my_instr.write(f'OUTP:DEL:RISE  {str(delay)},(@{str(channel)})')
+        self._set('OUTP:DEL:RISE',delay,channel)
 
     # TTo program turn-on delay 
     def setTurn_OFF_Delay(self,channel:int,delay:float):
-        self.my_instr.write(f'OUTP:DEL:FALL  {str(delay)},(@{str(channel)})')
+        self._set('OUTP:DEL:FALL',delay,channel)
 
 
     # # ! Coupling of the channel is pending 
@@ -190,240 +317,339 @@ class N670x:
 
     # To program the OVP level for outputs
     def setOVP_Protection(self,channel:int,OVP:float):
-        self.my_instr.write(f'VOLT:PROT  {str(OVP)},(@{str(channel)})')
+        if self._setpoints.get(('VOLT:PROT',channel)) == OVP :
+            return
+        self._w(f'VOLT:PROT  {str(OVP)},{_chanlist(channel)}')
+        self._setpoints[('VOLT:PROT',channel)] = OVP
 
-    # To enable OCP for outputs 
+    # To enable OCP for outputs
     def setOCP_Protection(self,channel:int,OCP:float):
-        self.my_instr.write(f'CURR:PROT:STAT  {str(OCP)},(@{str(channel)})')
+        if self._setpoints.get(('CURR:PROT:STAT',channel)) == OCP :
+            return
+        self._w(f'CURR:PROT:STAT  {str(OCP)},{_chanlist(channel)}')
+        self._setpoints[('CURR:PROT:STAT',channel)] = OCP
 
     # To specify a 10 millisecond delay for the OCP
     def setOCP_Delay(self,channel:int,delay:float):
-        self.my_instr.write(f'CURR:PROT:DEL  {str(delay)},(@{str(channel)})')
+        self._set('CURR:PROT:DEL',delay,channel)
     
     # To enable output protection coupling
     def setOutput_Protection_Coupling_ON(self):
-        self.my_instr.write('OUTP:PROT:COUP ON')
+        self._w('OUTP:PROT:COUP ON')
 
 
-    def setOutput_Current_Protection_ON(self,channel:int):
-        self.my_instr.write(f'CURR:PROT:STAT ON,(@{str(channel)})')
+    def setOutput_Current_Protection(self,channel:int,state:bool):
+        state = bool(state)
+        if self._setpoints.get(('CURR:PROT:STAT',channel)) == state :
+            return
+        self._w(f'CURR:PROT:STAT {_ONOFF[state]},{_chanlist(channel)}')
+        self._setpoints[('CURR:PROT:STAT',channel)] = state
 
+    def setOutput_Current_Protection_ON(self,channel:int):
+        self.setOutput_Current_Protection(channel,True)
 
     def setOutput_Current_Protection_OFF(self,channel:int):
-        self.my_instr.write(f'CURR:PROT:STAT OFF,(@{str(channel)})')
+        self.setOutput_Current_Protection(channel,False)
 
+    def setOutput_Voltage_Protection(self,channel:int,state:bool):
+        state = bool(state)
+        if self._setpoints.get(('VOLT:PROT:STAT',channel)) == state :
+            return
+        self._w(f'VOLT:PROT:STAT {_ONOFF[state]},{_chanlist(channel)}')
+        self._setpoints[('VOLT:PROT:STAT',channel)] = state
 
     def setOutput_Voltage_Protection_ON(self,channel:int):
-        self.my_instr.write(f'VOLT:PROT:STAT ON,(@{str(channel)})')
+        self.setOutput_Voltage_Protection(channel,True)
 
     def setOutput_Voltage_Protection_OFF(self,channel:int):
-        self.my_instr.write(f'VOLT:PROT:STAT OFF,(@{str(channel)})')
+        self.setOutput_Voltage_Protection(channel,False)
 
     # To clear an output protection fault
+    # ? a trip forced the output off behind our back, so the cached OUTP
+    # ? state is stale and must be forgotten
     def clearOutput_Protection_Clear(self,channel:int):
-        self.my_instr.write(f'OUTP:PROT:CLE (@{str(channel)})')
+        self._w(f'OUTP:PROT:CLE {_chanlist(channel)}')
+        self._setpoints.pop(('OUTP',channel),None)
 
     def protection_Status_Current(self):
-        return self.my_instr.query('CURRent:PROTection:STATe?')
+        return self._q('CURRent:PROTection:STATe?')
 
     def protection_Status_Voltage(self):
-        return self.my_instr.query('VOLTage:PROTection:STATe?')
+        return self._q('VOLTage:PROTection:STATe?')
 
 
     
     def arbFunction_Priority__Voltage(self,channel:int):
-        self.my_instr.write(f'ARB:FUNC:TYPE VOLT,(@{str(channel)})')
+        self._w(f'ARB:FUNC:TYPE VOLT,{_chanlist(channel)}')
 
     def arbFunction_Sequence__Set(self,channel:int):
-        self.my_instr.write(f'ARB:FUNC:SHAP SEQ,(@{str(channel)})')
+        self._w(f'ARB:FUNC:SHAP SEQ,{_chanlist(channel)}')
 
     def arbFunction_Sequence__Reset(self,channel:int):
-        self.my_instr.write(f'ARB:SEQ:RES(@{str(channel)})')
+        self._w(f'ARB:SEQ:RES{_chanlist(channel)}')
     
     def arbSet_Sequence_Waveform(self,channel:int):
-        self.arbFunction_Priority__Voltage(channel)
-        self.arbFunction_Sequence__Set(channel)
+        self._w(f'ARB:FUNC:TYPE VOLT,{_chanlist(channel)};:ARB:FUNC:SHAP SEQ,{_chanlist(channel)}')
 
+    # ? every Arb setup below goes out as one ';:' chained message, a single
+    # ? bus transaction instead of one per parameter
     def arb_Pulse__Voltage(self,channel:int,initial_Voltage:float,end_Voltage:float,initial_Time:float,top_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:VOLT:PULS:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:PULS:TOP  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:PULS:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:PULS:TOP:TIM  {str(top_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:PULS:END:TIM   {str(end_Time)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:PULS:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:PULS:TOP {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:PULS:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:PULS:TOP:TIM {str(top_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:PULS:END:TIM {str(end_Time)},{_chanlist(channel)}')
     def arb_Pulse__Current(self,channel:int,initial_Current:float,end_Current:float,initial_Time:float,top_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:CURR:PULS:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:PULS:TOP  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:PULS:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:PULS:TOP:TIM  {str(top_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:PULS:END:TIM   {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:TERM:LAST OFF,(@{str(channel)})')
-        self.my_instr.write(f'TRIG:ARB:SOUR BUS')
-        self.my_instr.write(f'INIT:TRAN(@{str(channel)})')
+        self._w(f'ARB:CURR:PULS:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:PULS:TOP {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:PULS:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:PULS:TOP:TIM {str(top_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:PULS:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:TERM:LAST OFF,{_chanlist(channel)}'
+                            f';:TRIG:ARB:SOUR BUS'
+                            f';:INIT:TRAN {_chanlist(channel)}')
+        # ? the transient system must be armed before any *TRG goes out
+        self._flush_sync()
     
-    # The parameter setting remains at the last Arb value after the Arb completes.
+    # ON: the parameter setting remains at the last Arb value after the Arb completes.
+    # OFF: it returns to the DC value that was in effect prior to the Arb
+    def arbLast_Value(self,channel:int,state:bool):
+        self._w(f'ARB:TERM:LAST {_ONOFF[bool(state)]},{_chanlist(channel)}')
+
     def arbLast_Value_ON(self,channel:int):
-        self.my_instr.write(f'ARB:TERM:LAST ON,(@{str(channel)})')
+        self.arbLast_Value(channel,True)
 
-    # The parameter setting returns to the DC value that was in effect prior to the Arb
     def arbLast_Value_OFF(self,channel:int):
-        self.my_instr.write(f'ARB:TERM:LAST OFF,(@{str(channel)})')
+        self.arbLast_Value(channel,False)
     
     def arb_Trigger(self):
-        self.my_instr.write('*TRG')
+        self._w('*TRG')
 
     def arb_Step__Current(self,channel:int,initial_Current:float,end_Current:float,initial_Time:float):
-        self.my_instr.write(f'ARB:CURR:STEP:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STEP:END  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STEP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
+        self._w(f'ARB:CURR:STEP:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STEP:END {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STEP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}')
 
     def arb_Step__Voltage(self,channel:int,initial_Voltage:float,end_Voltage:float,initial_Time:float):
-        self.my_instr.write(f'ARB:VOLT:STEP:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STEP:END  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STEP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:STEP:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STEP:END {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STEP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}')
     
     def arb_Ramp__Voltage(self,channel:int,initial_Voltage:float,end_Voltage:float,initial_Time:float,raise_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:VOLT:RAMP:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:RAMP:END  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:RAMP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:RAMP:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:RAMP:RTIM  {str(raise_Time)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:RAMP:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:RAMP:END {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:RAMP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:RAMP:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:RAMP:RTIM {str(raise_Time)},{_chanlist(channel)}')
     
     def arb_Ramp__Current(self,channel:int,initial_Current:float,end_Current:float,initial_Time:float,raise_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:CURR:RAMP:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:RAMP:END  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:RAMP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:RAMP:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:RAMP:RTIM  {str(raise_Time)},(@{str(channel)})')
+        self._w(f'ARB:CURR:RAMP:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:RAMP:END {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:RAMP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:RAMP:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:RAMP:RTIM {str(raise_Time)},{_chanlist(channel)}')
     
     def arb_Staircase__Voltage(self,channel:int,steps:int,initial_Voltage:float,end_Voltage:float,initial_Time:float,raise_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:VOLT:STA:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STA:END  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STA:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STA:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STA:TIM  {str(raise_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:STA:NST  {str(steps)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:STA:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STA:END {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STA:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STA:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STA:TIM {str(raise_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:STA:NST {str(steps)},{_chanlist(channel)}')
     
     def arb_Staircase__Current(self,channel:int,steps:int,initial_Current:float,end_Current:float,initial_Time:float,raise_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:CURR:STA:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STA:END  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STA:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STA:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STA:TIM  {str(raise_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:STA:NST  {str(steps)},(@{str(channel)})')
+        self._w(f'ARB:CURR:STA:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STA:END {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STA:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STA:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STA:TIM {str(raise_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:STA:NST {str(steps)},{_chanlist(channel)}')
     
     def arb_Trapezoid__Voltage(self,channel:int,initial_Voltage:float,end_Voltage:float,initial_Time:float,raise_Time:float,top_Time:float,fall_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:volt:TRAP:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:END  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:TOP:TIM  {str(top_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:RTIM  {str(raise_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:volt:TRAP:FTIM  {str(fall_Time)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:TRAP:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:END {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:TOP:TIM {str(top_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:RTIM {str(raise_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:TRAP:FTIM {str(fall_Time)},{_chanlist(channel)}')
     
     def arb_Trapezoid__Current(self,channel:int,initial_Current:float,end_Current:float,initial_Time:float,raise_Time:float,top_Time:float,fall_Time:float,end_Time:float,count=1,LastOFF=0):
-        self.my_instr.write(f'CURR:MODE ARB,(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:TOP  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:END:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:TOP:TIM  {str(top_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:RTIM  {str(raise_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:TRAP:FTIM  {str(fall_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:COUN  {str(count)},(@{str(channel)})')
-        self.arbLast_Value_OFF(channel=1)
-        if LastOFF !=0 :
-            self.arbLast_Value_ON(channel=1)
+        self._w(f'CURR:MODE ARB,{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:TOP {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:END:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:TOP:TIM {str(top_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:RTIM {str(raise_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:TRAP:FTIM {str(fall_Time)},{_chanlist(channel)}'
+                            f';:ARB:COUN {str(count)},{_chanlist(channel)}'
+                            # ? final last-value state folded into the same message
+                            # ? (channel 1 kept from the original trailing writes)
+                            f';:ARB:TERM:LAST {_ONOFF[LastOFF != 0]},{_chanlist(1)}')
+        # ? pipelined setup is settled before the caller arms or triggers
+        self._flush_sync()
     
     def arb_Exponential__Current(self,channel:int,initial_Current:float,end_Current:float,initial_Time:float,tcon_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:CURR:EXP:STAR  {str(initial_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:EXP:END  {str(end_Current)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:EXP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:EXP:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:CURR:EXP:TCON  {str(tcon_Time)},(@{str(channel)})')
+        self._w(f'ARB:CURR:EXP:STAR {str(initial_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:EXP:END {str(end_Current)},{_chanlist(channel)}'
+                            f';:ARB:CURR:EXP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:EXP:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:CURR:EXP:TCON {str(tcon_Time)},{_chanlist(channel)}')
    
     def arb_Exponential__Voltage(self,channel:int,initial_Voltage:float,end_Voltage:float,initial_Time:float,tcon_Time:float,end_Time:float):
-        self.my_instr.write(f'ARB:VOLT:EXP:STAR  {str(initial_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:EXP:END  {str(end_Voltage)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:EXP:STAR:TIM  {str(initial_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:EXP:TIM  {str(end_Time)},(@{str(channel)})')
-        self.my_instr.write(f'ARB:VOLT:EXP:TCON  {str(tcon_Time)},(@{str(channel)})')
+        self._w(f'ARB:VOLT:EXP:STAR {str(initial_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:EXP:END {str(end_Voltage)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:EXP:STAR:TIM {str(initial_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:EXP:TIM {str(end_Time)},{_chanlist(channel)}'
+                            f';:ARB:VOLT:EXP:TCON {str(tcon_Time)},{_chanlist(channel)}')
      
+    # * Sine Arb setup in the same one-write style as the other shapes
+    # ! amplitude and offset are separate SCPI headers, keep the arguments
+    # ! distinct -- a sine riding a DC rail needs both
+    def arb_Sine__Voltage(self,channel:int,amplitude:float,offset:float,frequency:float,count=1):
+        self._w(f'VOLT:MODE ARB,{_chanlist(channel)}'
+                f';:ARB:FUNC:TYPE VOLT,{_chanlist(channel)}'
+                f';:ARB:FUNC:SHAP SIN,{_chanlist(channel)}'
+                f';:ARB:VOLT:SIN:AMPL {str(amplitude)},{_chanlist(channel)}'
+                f';:ARB:VOLT:SIN:OFFS {str(offset)},{_chanlist(channel)}'
+                f';:ARB:VOLT:SIN:FREQ {str(frequency)},{_chanlist(channel)}'
+                f';:ARB:COUN {str(count)},{_chanlist(channel)}'
+                f';:TRIG:ARB:SOUR BUS'
+                f';:INIT:TRAN {_chanlist(channel)}')
+        # ? armed and settled before the caller fires *TRG
+        self._flush_sync()
+
     def arb_Immediate_Trigger(self):
-        self.my_instr.write('TRIG:ARB:SOUR IMM')
+        self._w('TRIG:ARB:SOUR IMM')
     
     def arb_Mode__Voltage(self,channel:int):
-        self.my_instr.write(f'VOLT:MODE ARB(@{str(channel)})')
+        self._w(f'VOLT:MODE ARB{_chanlist(channel)}')
     
     def arb_Mode__Current(self,channel:int):
-        self.my_instr.write(f'CURR:MODE ARB(@{str(channel)})')
+        self._w(f'CURR:MODE ARB{_chanlist(channel)}')
     
 
         
+    # ? the channel list on the MEAS/FETC query addresses the output by
+    # ? itself, no INST:SEL write (and its bus transaction) per sample
     def getVoltage(self, channel:int):
-        if channel in self.channel.keys() :
-            ch = self.channel.get(channel)
-        else:
-            ch = self.channel.get(1)
-        command = 'INST:SEL ' +  ch
-        self.my_instr.write(command)
         # ! sleep time to measure the voltage is optional but minimum sleep time needs to provided even atleast in the main program    
         # time.sleep(0.2)
-        return float(self.my_instr.query(f'MEAS:VOLT? (@{str(channel)})'))
+        return float(self._q(f'MEAS:VOLT? {_chanlist(channel)}'))
     
     def getCurrent(self, channel:int):
-        if channel in self.channel.keys() :
-            ch = self.channel.get(channel)
-        else:
-            ch = self.channel.get(1)
-        command = 'INST:SEL ' +  ch
-        self.my_instr.write(command)
-        # ! sleep time to measure the voltage is optional but minimum sleep time needs to provided even atleast in the main program    
-        # time.sleep(0.2)
-        return float(self.my_instr.query(f'MEAS:CURR? (@{str(channel)})'))
+        return float(self._q(f'MEAS:CURR? {_chanlist(channel)}'))
     
+    # * Voltage and current of one channel in a single compound query
+    # ? the two MEAS queries ride one message and the ';' separated answer
+    # ? is split back out, one round trip instead of two
+    def getVoltageCurrent(self,channel:int):
+        volt,curr = self._query_many((f'MEAS:VOLT? {_chanlist(channel)}',
+                                      f'MEAS:CURR? {_chanlist(channel)}'))
+        return float(volt),float(curr)
+
+    # * Measure several channels in one round trip via a SCPI channel list
+    # ? MEAS:VOLT? (@1,2,3,4) returns comma separated readings, one query
+    # ? instead of one blocking query per channel
+    def getVoltages(self,channels=(1,2,3,4)):
+        resp = self._q(f'MEAS:VOLT? {_chanlist(tuple(channels))}')
+        return [float(value) for value in resp.split(',')]
+
+    def getCurrents(self,channels=(1,2,3,4)):
+        resp = self._q(f'MEAS:CURR? {_chanlist(tuple(channels))}')
+        return [float(value) for value in resp.split(',')]
+
+    # * Switch fetch/measure responses to IEEE-488.2 binary blocks
+    # ? 4 bytes per reading instead of 12-15 ASCII chars, and the block is
+    # ? decoded straight into a numpy array with no float() parsing
+    def set_Format_Binary(self):
+        self._w('FORM:DATA REAL;:FORM:BORD NORM')
+
+    def set_Format_ASCII(self):
+        self._w('FORM:DATA ASC')
+
+    # ! call set_Format_Binary() once before using the binary readers
+    def getVoltages_Binary(self,channels=(1,2,3,4)):
+        return self.my_instr.query_binary_values(f'MEAS:VOLT? {_chanlist(tuple(channels))}',
+                                                 datatype='f',is_big_endian=True,
+                                                 container=np.ndarray)
+
+    def getCurrents_Binary(self,channels=(1,2,3,4)):
+        return self.my_instr.query_binary_values(f'MEAS:CURR? {_chanlist(tuple(channels))}',
+                                                 datatype='f',is_big_endian=True,
+                                                 container=np.ndarray)
+
     def setCurrRange(self, channel:int):
         if channel in self.channel.keys() :
             ch = self.channel.get(channel)
         else:
             ch = self.channel.get(1)
-        command = 'INST:SEL ' +  ch
-        self.my_instr.write(command)
-        # ! sleep time to measure the voltage is optional but minimum sleep time needs to provided even atleast in the main program    
-        # time.sleep(0.2)
-        string = (f'SENS:CURR:RANG 10e-3,(@{str(channel)})')
-        self.my_instr.write(string)
+        string = (f'SENS:CURR:RANG 10e-3,{_chanlist(channel)}')
+        # ? channel select and range set ride in one chained message
+        self._write_many(('INST:SEL ' + ch,string))
         print (string)
         print(ch)
         return
         
     def get_PeviousTriggered_Voltage(self, channel:int):
-        if channel in self.channel.keys() :
-            ch = self.channel.get(channel)
-        else:
-            ch = self.channel.get(1)
-        command = 'INST:SEL ' +  ch
-        self.my_instr.write(command)
-        # ! sleep time to measure the voltage is optional but minimum sleep time needs to provided even atleast in the main program    
-        # time.sleep(0.2)
-        return float(self.my_instr.query('FETC:VOLT?'))
+        return float(self._q(f'FETC:VOLT? {_chanlist(channel)}'))
     
     def get_PeviousTriggered_Current(self, channel:int):
-        if channel in self.channel.keys() :
-            ch = self.channel.get(channel)
-        else:
-            ch = self.channel.get(1)
-        command = 'INST:SEL ' +  ch
-        self.my_instr.write(command)
-        # ! sleep time to measure the voltage is optional but minimum sleep time needs to provided even atleast in the main program    
-        # time.sleep(0.2)
-        return float(self.my_instr.query('FETC:CURR?'))
+        return float(self._q(f'FETC:CURR? {_chanlist(channel)}'))
         
+    # * Internal ELOG data logger: the supply samples V/I on its own clock
+    # * and one burst fetch replaces a blocking query per sample
+    def elog_Start(self,channel:int,period:float=1.0):
+        self._write_many((f'SENS:ELOG:FUNC:VOLT ON,{_chanlist(channel)}',
+                          f'SENS:ELOG:FUNC:CURR ON,{_chanlist(channel)}',
+                          f'SENS:ELOG:PER {str(period)},{_chanlist(channel)}',
+                          f'INIT:ELOG {_chanlist(channel)}'))
+
+    # ? records arrive interleaved voltage,current per sample interval
+    def elog_Fetch(self,channel:int,max_records:int=60):
+        resp = self._q(f'FETC:ELOG? {str(max_records)},{_chanlist(channel)}')
+        return [float(value) for value in resp.split(',')]
+
+    # * Binary ELOG burst fetch, pairs with set_Format_Binary()
+    # ? 4 bytes per reading decoded straight into a numpy array instead of
+    # ? a float() loop over the ASCII burst; the win grows with soak length
+    def elog_Fetch_Binary(self,channel:int,max_records:int=60):
+        return self.my_instr.query_binary_values(f'FETC:ELOG? {str(max_records)},{_chanlist(channel)}',
+                                                 datatype='f',is_big_endian=True,
+                                                 container=np.ndarray)
+
+    def elog_Stop(self,channel:int):
+        self._w(f'ABOR:ELOG {_chanlist(channel)}')
+
+    # * Burn-in: let the logger run for the whole soak and read one burst
+    # ? a single sleep for the soak window, no per-sample polling traffic
+    def run_Burn_In(self,channel:int,duration_sec:float,period:float=1.0):
+        self.elog_Start(channel,period)
+        time.sleep(duration_sec)
+        data = self.elog_Fetch(channel,int(duration_sec / period))
+        self.elog_Stop(channel)
+        return data
+
+    # * Async facade: the blocking VISA call runs in a worker thread so an
+    # ? asyncio application can await it without stalling the event loop
+    # ! one VISA session still executes one message at a time -- these let
+    # ! separate instruments overlap, not calls on the same supply
+    async def agetVoltages(self,channels=(1,2,3,4)):
+        return await asyncio.to_thread(self.getVoltages,channels)
+
+    async def agetCurrents(self,channels=(1,2,3,4)):
+        return await asyncio.to_thread(self.getCurrents,channels)
+
+    async def arun_Burn_In(self,channel:int,duration_sec:float,period:float=1.0):
+        return await asyncio.to_thread(self.run_Burn_In,channel,duration_sec,period)
+
     # o enable seamless voltage or current autoranging
     def setMeter_Range_Auto__Current(self,channel:int):
-        self.my_instr.write(f'SENS:CURR:RANG:AUTO ON,(@{str(channel)})')
+        self._w(f'SENS:CURR:RANG:AUTO ON,{_chanlist(channel)}')
 
     def setMeter_Range_Auto__Voltage(self,channel:int):
-        self.my_instr.write(f'SENS:VOLT:RANG:AUTO ON,(@{str(channel)})')
+        self._w(f'SENS:VOLT:RANG:AUTO ON,{_chanlist(channel)}')
 
         
 
@@ -431,22 +657,22 @@ class N670x:
 #         Specifies the emulation mode on N678xA <type> = PS4Q, PS2Q,
 # PS1Q, BATTery, CHARger, CCLoad, CVLoad, VMETer, AMETer
     def emulMode_Battery(self,channel:int):
-        self.my_instr.write(f'EMUL BATTery,(@{str(channel)})')
+        self._w(f'EMUL BATTery,{_chanlist(channel)}')
 
     def emulMode_2Q(self,channel:int):
-        self.my_instr.write(f'EMUL PS2Q,(@{str(channel)})')
+        self._w(f'EMUL PS2Q,{_chanlist(channel)}')
 
     def emulMode_1Q(self,channel:int):
-        self.my_instr.write(f'EMUL PS2Q,(@{str(channel)})')
+        self._w(f'EMUL PS1Q,{_chanlist(channel)}')
 
     def emulMode_4Q(self,channel:int):
-        self.my_instr.write(f'EMUL PS4Q,(@{str(channel)})')
+        self._w(f'EMUL PS4Q,{_chanlist(channel)}')
 
     def emulMode_CC_Load(self,channel:int):
-        self.my_instr.write(f'EMUL CCLoad,(@{str(channel)})')
+        self._w(f'EMUL CCLoad,{_chanlist(channel)}')
 
     def emulMode_CV_Load(self,channel:int):
-        self.my_instr.write(f'EMUL CVLoad,(@{str(channel)})')
+        self._w(f'EMUL CVLoad,{_chanlist(channel)}')
 
 if __name__ == '__main__':
     supply = N670x('USB0::0x0957::0x0F07::MY50002157::INSTR')
@@ -3,11 +3,18 @@ import pyvisa as visa
 from pyvisa.attributes import *
 from pyvisa.constants import *
 
+# ? the shared ResourceManager works both as a package import and when a
+# ? driver file is run directly as a script
+try:
+    from ._visa import get_resource_manager
+except ImportError:
+    from _visa import get_resource_manager
+
 # ('USB0::0x2A8D::0x0F02::MY56002702::INSTR', 'USB0::0x0699::0x0401::C020132::INSTR', 'TCPIP0::172.16.10.29::inst0::INSTR', 'GPIB0::6::INSTR')
 class RP790x:
 
     def __init__(self,port='USB0::0x2A8D::0x2802::MY59003109::INSTR') -> None:
-        rm = visa.ResourceManager()
+        rm = get_resource_manager()
         rm.list_resources()
         self.my_instr = rm.open_resource(port)
         # self.my_instr.set_visa_attribute(visa.constants.VI_ATTR_ASRL_BAUD, 9600)
@@ -1,13 +1,23 @@
-import time 
+import time
+import numpy as np
 import pyvisa as visa
 # from pyvisa.attributes import *
 # from pyvisa.constants import *
 
+# ? the shared ResourceManager works both as a package import and when a
+# ? driver file is run directly as a script
+try:
+    from ._visa import get_resource_manager
+except ImportError:
+    from _visa import get_resource_manager
+
 
 class A34461:
 
+    __slots__ = ('meter',)
+
     def __init__(self,port:str) -> None:
-        rm = visa.ResourceManager()
+        rm = get_resource_manager()
         rm.list_resources()
         self.meter = rm.open_resource(port)
         # self.meter.set_visa_attribute(visa.constants.VI_ATTR_ASRL_BAUD, 9600)
@@ -22,24 +32,17 @@ class A34461:
         return (self.meter.query('*IDN?'))
     
     def reset(self):
-        self.meter.write('*RST')     
+        self.meter.write('*RST')
 
     def get_error(self):
-        return self.meter.query('SYST:ERR?')  
-    
-    def reset(self):
-        self.meter.write('*RST')     
-
-    def get_error(self):
-        return self.meter.query('SYST:ERR?')  
+        return self.meter.query('SYST:ERR?')
 
 
     def read_value(self, cnt):
-        self.meter.write(':SAMP:COUN ' + str(cnt) +';:TRIG:SOUR IMM')      
+        self.meter.write(':SAMP:COUN ' + str(cnt) +';:TRIG:SOUR IMM')
         data_str= self.meter.query(':READ?')
-        data_split = data_str.split(sep =',')
-        value = list(map(float, data_split))
-        return(sum(value) / len(value))
+        # ? decode + average in C instead of a per-sample Python float() loop
+        return float(np.array(data_str.split(','), dtype=np.float64).mean())
 
     def meas_V(self, range = -1, count = 4):
         self.meter.write(':FUNC "VOLT:DC"') 
@@ -240,9 +243,9 @@ class A34461:
         return float(self.meter.query('MEAS:VOLT:DC?'))
     
     # <range>: 100 mV, 1 V, 10 V, 100 V, 1000 V, AUTO (default) or DEFault
-    # <resolution> (DC): optional and ignored; fixed at 6½ digits.  
+    # <resolution> (DC): optional and ignored; fixed at 6½ digits.
     # # Resolution 0.001 PLC 0.002 PLC 0.006 PLC 0.02 PLC 0.06 PLC  0.2 PLC  1 PLC  10 PLC 100 PLC
-    def meas_meter__AcCurrent(self):
+    def meas_meter__AcVoltage(self):
         return float(self.meter.query('MEAS:VOLT:AC?'))
     
 
@@ -3,11 +3,18 @@ import pyvisa as visa
 from pyvisa.attributes import *
 from pyvisa.constants import *
 
+# ? the shared ResourceManager works both as a package import and when a
+# ? driver file is run directly as a script
+try:
+    from ._visa import get_resource_manager
+except ImportError:
+    from _visa import get_resource_manager
+
 
 class E362X:
 
     def __init__(self,port='GPIB0::7::INSTR') -> None:
-        rm = visa.ResourceManager()
+        rm = get_resource_manager()
         rm.list_resources()
         self.supply = rm.open_resource(port)
         # self.supply.set_visa_attribute(visa.constants.VI_ATTR_ASRL_BAUD, 9600)
@@ -0,0 +1,13 @@
+import pyvisa as visa
+
+# ? one ResourceManager for the whole process; backend startup walks the
+# ? VISA installation (100s of ms, minutes on a cold NI-VISA load) and all
+# ? ResourceManager instances share the same underlying session anyway, so
+# ? dropping throwaway ones risks invalidating other instruments' handles
+_rm = None
+
+def get_resource_manager():
+    global _rm
+    if _rm is None :
+        _rm = visa.ResourceManager()
+    return _rm